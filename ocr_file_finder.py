@@ -1,173 +1,316 @@
 import os
+import re
+import errno
+import logging
 import shutil
 import sys
 import ctypes
-import filecmp
+import threading
 from datetime import datetime, timedelta
+from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+log = logging.getLogger("ocr")
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# CopyFileW lets the SMB redirector do a server-side copy when source and destination allow it.
+# FindFirstFileExW with FIND_FIRST_EX_LARGE_FETCH asks SMB for bigger directory batches per round trip.
+if os.name == 'nt':
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+
+    _CopyFileW = _kernel32.CopyFileW
+    _CopyFileW.argtypes = [ctypes.c_wchar_p, ctypes.c_wchar_p, ctypes.c_int]
+
+    _FindFirstFileExW = _kernel32.FindFirstFileExW
+    _FindFirstFileExW.argtypes = [wintypes.LPCWSTR, ctypes.c_int, ctypes.c_void_p, ctypes.c_int,
+                                  ctypes.c_void_p, wintypes.DWORD]
+    _FindFirstFileExW.restype = wintypes.HANDLE
+    _FindNextFileW = _kernel32.FindNextFileW
+    _FindNextFileW.argtypes = [wintypes.HANDLE, ctypes.c_void_p]
+    _FindNextFileW.restype = wintypes.BOOL
+    _FindClose = _kernel32.FindClose
+    _FindClose.argtypes = [wintypes.HANDLE]
+else:
+    _CopyFileW = None
+    _FindFirstFileExW = None
+
+FIND_EX_INFO_BASIC = 1
+FIND_EX_SEARCH_NAME_MATCH = 0
+FIND_FIRST_EX_LARGE_FETCH = 2
+FILE_ATTRIBUTE_DIRECTORY = 0x10
+FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+IO_REPARSE_TAG_SYMLINK = 0xA000000C
+ERROR_FILE_EXISTS = 80
+ERROR_NO_MORE_FILES = 18
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+# Every casing of the .db extension, so names can be checked without lower()
+_SKIP_EXT = ('.db', '.DB', '.Db', '.dB')
+
+# Layout is server/YYYY/MM-YYYY/MM_DD/<job>/...; job folders sit within this many levels of a day folder
+JOB_SEARCH_DEPTH = 3
+# From the archive root the year, month and day folders come first
+ARCHIVE_SEARCH_DEPTH = JOB_SEARCH_DEPTH + 3
+
+# Shared pool for network I/O; SMB shares saturate at a few dozen concurrent requests
+_IO_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="ocr-io")
+
 def get_file_base_names(prompt_dir):
     """Get base names of files excluding .db files."""
-    files = [
-        os.path.splitext(f)[0]
-        for f in os.listdir(prompt_dir)
-        if os.path.isfile(os.path.join(prompt_dir, f)) and not f.lower().endswith('.db')
-    ]
-    print(f"Found {len(files)} files to process")
+    with os.scandir(prompt_dir) as it:
+        files = [
+            os.path.splitext(entry.name)[0]
+            for entry in it
+            if entry.is_file() and not entry.name.endswith(_SKIP_EXT)
+        ]
+    log.info("Found %d files to process", len(files))
     return files
 
-def find_incremental_business_day_folders(search_dirs_2025, base_name):
-    """Search incrementally - yesterday first, then expand if no matches found."""
+@lru_cache(maxsize=None)
+def list_day_folders(month_path):
+    """Get the names of the day folders in a month folder, listing each month only once."""
+    try:
+        with os.scandir(month_path) as it:
+            return frozenset(entry.name for entry in it if entry.is_dir())
+    except OSError:
+        return frozenset()
+
+@lru_cache(maxsize=None)
+def find_business_day_folders(search_dirs_2025, first_day, last_day):
+    """
+    Collect the existing day folders from first_day to last_day days back (inclusive).
+    Cached, so the directory discovery is only done once per run.
+    """
     current_date = datetime.now()
 
-    # First check last 7 days one by one, stopping as soon as matches are found
-    for days_back in range(1, 8):
+    # Work out which day folders to check, keyed by their month folder
+    wanted_days = []
+    for days_back in range(first_day, last_day + 1):
         target_date = current_date - timedelta(days=days_back)
-        day_name = target_date.strftime("%A")
-
         month_part = target_date.strftime("%m-%Y")
         day_part = target_date.strftime("%m_%d")
-
-        # Check each server directory for this day
-        day_dirs = []
         for base_dir in search_dirs_2025:
-            check_path = os.path.join(base_dir, month_part, day_part)
-            if os.path.isdir(check_path):
-                day_dirs.append(check_path)
-
-        if day_dirs:
-            # Search for matches in this day's directories
-            matches = []
-            with ThreadPoolExecutor(max_workers=len(day_dirs)) as executor:
-                futures = {executor.submit(search_directory_for_matches, d, base_name): d for d in day_dirs}
-
-                # Process results as they come in - stop as soon as we find any matches
-                for fut in as_completed(futures):
-                    result = fut.result()
-                    if result:
-                        matches.extend(result)
-                        # Cancel remaining futures since we found matches
-                        for remaining_fut in futures:
-                            if not remaining_fut.done():
-                                remaining_fut.cancel()
-                        break
-
-            if matches:
-                print(f"  Found {len(matches)} matches in {day_name}")
-                return matches
-
-    # If no matches in last 7 days, search rest of 2025
-    print(f"  Expanding to full 2025 search...")
-    all_matches = []
-
-    # Search remaining days in 2025
-    with ThreadPoolExecutor(max_workers=16) as executor:
-        # Submit all directory existence checks first
-        directory_futures = []
-        for days_back in range(8, 366):
-            target_date = current_date - timedelta(days=days_back)
-            month_part = target_date.strftime("%m-%Y")
-            day_part = target_date.strftime("%m_%d")
-            for base_dir in search_dirs_2025:
-                check_path = os.path.join(base_dir, month_part, day_part)
-                directory_futures.append((executor.submit(os.path.isdir, check_path), check_path))
-
-        # Collect existing directories
-        existing_dirs = []
-        for fut, path in directory_futures:
-            if fut.result():
-                existing_dirs.append(path)
-
-        # Now search all existing directories for matches
-        if existing_dirs:
-            search_futures = {executor.submit(search_directory_for_matches, d, base_name): d for d in existing_dirs}
-            for fut in as_completed(search_futures):
-                result = fut.result()
-                if result:
-                    all_matches.extend(result)
-
-    return all_matches
+            wanted_days.append((os.path.join(base_dir, month_part), day_part))
+
+    # List each month folder once and check the day folders against it
+    month_paths = list(dict.fromkeys(month_path for month_path, _ in wanted_days))
+    if len(month_paths) <= 2:
+        listings = map(list_day_folders, month_paths)
+    else:
+        listings = _IO_POOL.map(list_day_folders, month_paths)
+    month_listings = dict(zip(month_paths, listings))
+
+    return tuple(
+        os.path.join(month_path, day_part)
+        for month_path, day_part in wanted_days
+        if day_part in month_listings[month_path]
+    )
+
+def find_incremental_business_day_folders(search_dirs_2025, target_names):
+    """
+    Search incrementally - yesterday first, then expand for names without matches.
+    Returns a dict of target name -> matching folders.
+    """
+    search_dirs_2025 = tuple(search_dirs_2025)
+    current_date = datetime.now()
+    found = {}
+    pending = list(target_names)
+
+    # First check last 7 days one by one, dropping names as soon as they have matches
+    for days_back in range(1, 8):
+        if not pending:
+            return found
+
+        day_name = (current_date - timedelta(days=days_back)).strftime("%A")
+
+        # Search this day's directories once for every pending name
+        day_dirs = find_business_day_folders(search_dirs_2025, days_back, days_back)
+        matches = search_directories(day_dirs, pending)
+        if matches:
+            log.info("  Found matches for %d files in %s", len(matches), day_name)
+            found.update(matches)
+            pending = [name for name in pending if name not in matches]
+
+    if not pending:
+        return found
+
+    # If some names have no matches in last 7 days, search rest of 2025
+    log.info("  Expanding to full 2025 search for %d files...", len(pending))
+    existing_dirs = find_business_day_folders(search_dirs_2025, 8, 365)
+    found.update(search_directories(existing_dirs, pending))
+    return found
+
+@lru_cache(maxsize=None)
+def _list_month(base_dir, target_month):
+    """Get the day folder paths in one server's month folder, shared by every phase."""
+    month_path = os.path.join(base_dir, target_month)
+    return tuple(os.path.join(month_path, name) for name in sorted(list_day_folders(month_path)))
 
 def get_month_folders(search_dirs, target_month, exclude_dirs):
     """Get all day folders for a specific month (MM-YYYY format)."""
     folders = []
     for base_dir in search_dirs:
-        month_path = os.path.join(base_dir, target_month)
-        if not os.path.exists(month_path):
-            continue
-        with os.scandir(month_path) as it:
-            for entry in it:
-                dir_path = os.path.join(month_path, entry.name)
-                if entry.is_dir() and dir_path not in exclude_dirs:
-                    folders.append(dir_path)
+        folders.extend(d for d in _list_month(base_dir, target_month) if d not in exclude_dirs)
     return folders
 
-def search_directory_for_matches(root_dir, target_name):
-    """Recursively find all directories containing 'target_name' in their folder name."""
-    matches = []
-    for entry in os.scandir(root_dir):
-        if entry.is_dir():
-            if target_name in entry.name:
-                matches.append(entry.path)
-            matches.extend(search_directory_for_matches(entry.path, target_name))
+def iter_subdirs(path):
+    """
+    Yield (name, path) for each subdirectory of path, without following symlinks.
+    On Windows this enumerates with FindFirstFileExW and FIND_FIRST_EX_LARGE_FETCH.
+    """
+    if _FindFirstFileExW is None:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield entry.name, entry.path
+        return
+
+    find_data = wintypes.WIN32_FIND_DATAW()
+    handle = _FindFirstFileExW(os.path.join(path, '*'), FIND_EX_INFO_BASIC, ctypes.byref(find_data),
+                               FIND_EX_SEARCH_NAME_MATCH, None, FIND_FIRST_EX_LARGE_FETCH)
+    if handle == INVALID_HANDLE_VALUE:
+        raise ctypes.WinError(ctypes.get_last_error())
+
+    try:
+        while True:
+            name = find_data.cFileName
+            attrs = find_data.dwFileAttributes
+            # Skip '.', '..' and symlinks, the same entries os.scandir's is_dir(follow_symlinks=False) drops
+            if (attrs & FILE_ATTRIBUTE_DIRECTORY and name not in ('.', '..')
+                    and not (attrs & FILE_ATTRIBUTE_REPARSE_POINT
+                             and find_data.dwReserved0 == IO_REPARSE_TAG_SYMLINK)):
+                yield name, os.path.join(path, name)
+            if not _FindNextFileW(handle, ctypes.byref(find_data)):
+                error = ctypes.get_last_error()
+                if error != ERROR_NO_MORE_FILES:
+                    raise ctypes.WinError(error)
+                return
+    finally:
+        _FindClose(handle)
+
+def build_name_matcher(target_names):
+    """
+    Build a function that returns the target names found in a folder name.
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, otherwise a regex prefilter.
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for name in target_names:
+            automaton.add_word(name, name)
+        automaton.make_automaton()
+        return lambda folder_name: {name for _, name in automaton.iter(folder_name)}
+
+    pattern = re.compile("|".join(map(re.escape, target_names)))
+
+    def match_names(folder_name):
+        # The regex rejects most folders in one pass; only hits check each name
+        if not pattern.search(folder_name):
+            return ()
+        return [name for name in target_names if name in folder_name]
+
+    return match_names
+
+def search_directory_for_matches(root_dir, match_names, name_count, stop_event=None, max_depth=None):
+    """
+    Find all directories under root_dir whose folder name contains one of
+    name_count target names. Walks the tree once and returns a dict of
+    target name -> matching folders.
+    A matched folder is only searched further for the names it didn't match
+    (its whole contents get copied anyway), and is skipped once every name has
+    matched on its path. The walk goes at most max_depth levels below root_dir.
+    Stops early, returning what it has so far, once stop_event is set.
+    """
+    matches = {}
+    stack = [(root_dir, 1, frozenset())]
+
+    # Bind everything used per entry to locals; this loop runs for every folder in the archive
+    subdirs = iter_subdirs
+    push, pop = stack.append, stack.pop
+    add_match = matches.setdefault
+    stopped = stop_event.is_set if stop_event else None
+
+    while stack:
+        if stopped and stopped():
+            return matches
+        current, depth, matched = pop()
+        descend = max_depth is None or depth < max_depth
+        for folder_name, path in subdirs(current):
+            hits = match_names(folder_name)
+            if not hits:
+                if descend:
+                    push((path, depth + 1, matched))
+                continue
+            for name in hits:
+                if name not in matched:
+                    add_match(name, []).append(path)
+            matched_here = matched.union(hits)
+            if descend and len(matched_here) < name_count:
+                push((path, depth + 1, matched_here))
     return matches
 
-def incremental_search(base_name, search_dirs_2025, search_dirs_all):
+def search_directories(dirs, target_names, max_depth=JOB_SEARCH_DEPTH):
+    """Search several directories in parallel, merging the matches for each target name."""
+    matches = {}
+    if not dirs or not target_names:
+        return matches
+
+    # Each directory is a whole tree to walk, so even two of them are worth running side by side
+    match_names = build_name_matcher(target_names)
+    stop = threading.Event()
+    futures = [_IO_POOL.submit(search_directory_for_matches, d, match_names, len(target_names), stop, max_depth)
+               for d in dirs]
+    try:
+        results = [fut.result() for fut in as_completed(futures)]
+    except BaseException:
+        # cancel() only drops walks that haven't started; the event stops the running ones
+        stop.set()
+        for fut in futures:
+            fut.cancel()
+        raise
+
+    for result in results:
+        for name, paths in result.items():
+            matches.setdefault(name, []).extend(paths)
+    return matches
+
+def incremental_search(target_names, search_dirs_2025, search_dirs_all):
     """
-    Incremental search - start with recent days, expand only if no matches found.
+    Incremental search - start with recent days, expand only for names without matches.
+    Each phase walks its directories once for all pending names.
+    Returns a dict of target name -> matching folders.
     """
     # Phase 1: Incremental daily search (last 7 days, then full 2025 if needed)
-    matches = find_incremental_business_day_folders(search_dirs_2025, base_name)
-    if matches:
-        return matches, set()
+    found = find_incremental_business_day_folders(search_dirs_2025, target_names)
+    pending = [name for name in target_names if name not in found]
 
-    # Phase 2: Current month (if not already covered)
-    matches = []
     current_month = datetime.now().strftime("%m-%Y")
-    month_folders = get_month_folders(search_dirs_2025, current_month, set())
-    if month_folders:
-        with ThreadPoolExecutor(max_workers=16) as executor:
-            futures = {executor.submit(search_directory_for_matches, d, base_name): d for d in month_folders}
-            for fut in as_completed(futures):
-                result = fut.result()
-                if result:
-                    matches.extend(result)
-
-        if matches:
-            print(f"  Found matches in current month")
-            return matches, set()
-
-    # Phase 3: Previous month
     prev_month = (datetime.now().replace(day=1) - timedelta(days=1)).strftime("%m-%Y")
-    prev_month_folders = get_month_folders(search_dirs_2025, prev_month, set())
-    if prev_month_folders:
-        with ThreadPoolExecutor(max_workers=16) as executor:
-            futures = {executor.submit(search_directory_for_matches, d, base_name): d for d in prev_month_folders}
-            for fut in as_completed(futures):
-                result = fut.result()
-                if result:
-                    matches.extend(result)
 
+    # Phases 2-4: Current month, previous month, then full archive (last resort)
+    search_phases = [
+        {'get_dirs': lambda: get_month_folders(search_dirs_2025, current_month, set()), 'name': 'current month',
+         'max_depth': JOB_SEARCH_DEPTH},
+        {'get_dirs': lambda: get_month_folders(search_dirs_2025, prev_month, set()), 'name': 'previous month',
+         'max_depth': JOB_SEARCH_DEPTH},
+        {'get_dirs': lambda: [d for d in search_dirs_all if os.path.exists(d)], 'name': 'full archive',
+         'max_depth': ARCHIVE_SEARCH_DEPTH},
+    ]
+    for phase in search_phases:
+        if not pending:
+            break
+        matches = search_directories(phase['get_dirs'](), pending, phase['max_depth'])
         if matches:
-            print(f"  Found matches in previous month")
-            return matches, set()
-
-    # Phase 4: Full archive (last resort)
-    print(f"  Searching full archive...")
-    archive_folders = []
-    for base_dir in search_dirs_all:
-        if os.path.exists(base_dir):
-            archive_folders.append(base_dir)
-
-    if archive_folders:
-        with ThreadPoolExecutor(max_workers=16) as executor:
-            futures = {executor.submit(search_directory_for_matches, d, base_name): d for d in archive_folders}
-            for fut in as_completed(futures):
-                result = fut.result()
-                if result:
-                    matches.extend(result)
-
-    return matches, set()
+            log.info("  Found matches for %d files in %s", len(matches), phase['name'])
+            found.update(matches)
+            pending = [name for name in pending if name not in matches]
+
+    return found
 
 def find_original_file(prompt_dir, base_name):
     """Find the original file with the given base name."""
@@ -176,24 +319,61 @@ def find_original_file(prompt_dir, base_name):
             return os.path.join(prompt_dir, fname)
     return None
 
-def search_xray_covers_for_match(base_name, xray_covers_dir):
+def index_xray_covers(xray_covers_dir):
     """
-    Search for matching files in the X-ray covers directory.
-    Returns the full path of the matching file if found, None otherwise.
+    List the X-ray covers directory once.
+    Returns a list of (base name, full path) for every non-.db file.
     """
     if not os.path.exists(xray_covers_dir):
-        return None
+        return []
 
     try:
-        for file in os.listdir(xray_covers_dir):
-            if os.path.isfile(os.path.join(xray_covers_dir, file)) and not file.lower().endswith('.db'):
-                file_base = os.path.splitext(file)[0]
-                if base_name in file_base:
-                    return os.path.join(xray_covers_dir, file)
+        with os.scandir(xray_covers_dir) as it:
+            return [
+                (os.path.splitext(entry.name)[0], entry.path)
+                for entry in it
+                if entry.is_file() and not entry.name.endswith(_SKIP_EXT)
+            ]
     except (OSError, PermissionError):
-        pass
+        return []
+
+def search_xray_covers_for_match(base_name, xray_index):
+    """
+    Search the X-ray covers index for a file matching base_name.
+    Returns the full path of the matching file if found, None otherwise.
+    """
+    for file_base, path in xray_index:
+        if base_name in file_base:
+            return path
     return None
 
+def move_file(src, dst):
+    """
+    Move a file over dst, renaming in place when both are on the same share or drive.
+    shutil.move would fall back to copy and delete on Windows because dst already exists.
+    """
+    if os.path.splitdrive(src)[0].lower() == os.path.splitdrive(dst)[0].lower():
+        try:
+            os.replace(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.move(src, dst)
+
+def copy_file(src, dst):
+    """
+    Copy a file with CopyFileW where available, falling back to shutil.copy2.
+    Never overwrites: raises FileExistsError if dst already exists.
+    """
+    if _CopyFileW is not None:
+        if _CopyFileW(src, dst, True):
+            return
+        if ctypes.get_last_error() == ERROR_FILE_EXISTS:
+            raise FileExistsError(errno.EEXIST, "File already exists", dst)
+    elif os.path.exists(dst):
+        raise FileExistsError(errno.EEXIST, "File already exists", dst)
+    shutil.copy2(src, dst)
+
 def copy_files_from_matching_folders(matching_folders, prompt_dir, base_name):
     """
     Find all files in matching folders and copy them to the prompt directory
@@ -202,64 +382,81 @@ def copy_files_from_matching_folders(matching_folders, prompt_dir, base_name):
     if not matching_folders:
         return
 
-    copied_count = 0
+    # Track the names already in the prompt directory so conflicts never hit the network
+    with os.scandir(prompt_dir) as it:
+        existing = {os.path.normcase(entry.name) for entry in it}
 
+    # Walk the matching folders first, reserving a unique destination name for every file
+    copy_pairs = []
     for folder in matching_folders:
+        stack = [folder]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False) and not entry.name.endswith(_SKIP_EXT):
+                            base_file, ext = os.path.splitext(entry.name)
+                            dest_name = entry.name
+
+                            # Handle naming conflicts
+                            copy_num = 1
+                            while os.path.normcase(dest_name) in existing:
+                                dest_name = f"{base_file} ({copy_num}){ext}"
+                                copy_num += 1
+
+                            existing.add(os.path.normcase(dest_name))
+                            copy_pairs.append((entry.path, os.path.join(prompt_dir, dest_name)))
+            except (OSError, PermissionError):
+                continue
+
+    def copy_pair(pair):
         try:
-            for root, dirs, files in os.walk(folder):
-                for file in files:
-                    if not file.lower().endswith('.db'):
-                        source_file = os.path.join(root, file)
-
-                        # Create a unique name in the destination
-                        base_file, ext = os.path.splitext(file)
-                        dest_file = os.path.join(prompt_dir, file)
-
-                        # Handle naming conflicts
-                        copy_num = 1
-                        while os.path.exists(dest_file):
-                            new_name = f"{base_file} ({copy_num}){ext}"
-                            dest_file = os.path.join(prompt_dir, new_name)
-                            copy_num += 1
-
-                        shutil.copy2(source_file, dest_file)
-                        copied_count += 1
+            copy_file(*pair)
+            return True
         except (OSError, PermissionError):
-            continue
+            return False
 
-    return copied_count
+    # Then run the copies concurrently on the shared pool
+    return sum(_IO_POOL.map(copy_pair, copy_pairs))
 
 def rename_original_files_to_copy(prompt_dir):
     """
     Rename all non-.db files in the prompt directory to include '- Copy' in the name.
     """
     files_to_rename = []
+    existing = set()
 
-    # Get all files that need renaming
-    for file in os.listdir(prompt_dir):
-        file_path = os.path.join(prompt_dir, file)
-        if os.path.isfile(file_path) and not file.lower().endswith('.db') and '- Copy' not in file:
-            files_to_rename.append(file_path)
+    # Get all files that need renaming, tracking every name in use so conflicts
+    # are resolved without extra stat calls
+    with os.scandir(prompt_dir) as it:
+        for entry in it:
+            existing.add(os.path.normcase(entry.name))
+            if entry.is_file() and not entry.name.endswith(_SKIP_EXT) and '- Copy' not in entry.name:
+                files_to_rename.append(entry.path)
 
     # Rename each file
     for file_path in files_to_rename:
         filename = os.path.basename(file_path)
         base, ext = os.path.splitext(filename)
         new_filename = f"{base} - Copy{ext}"
-        new_path = os.path.join(prompt_dir, new_filename)
 
         # Handle naming conflicts
         copy_num = 1
-        while os.path.exists(new_path):
-            alt_name = f"{base} - Copy ({copy_num}){ext}"
-            new_path = os.path.join(prompt_dir, alt_name)
+        while os.path.normcase(new_filename) in existing:
+            new_filename = f"{base} - Copy ({copy_num}){ext}"
             copy_num += 1
 
-        os.rename(file_path, new_path)
+        existing.discard(os.path.normcase(filename))
+        existing.add(os.path.normcase(new_filename))
+        os.rename(file_path, os.path.join(prompt_dir, new_filename))
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
     if len(sys.argv) < 2:
-        print("No directory provided.")
+        log.error("No directory provided.")
         sys.exit(1)
 
     prompt_dir = sys.argv[1]
@@ -271,91 +468,70 @@ def main():
     prev_month = (datetime.now().replace(day=1) - timedelta(days=1)).strftime("%m-%Y")
 
 
-    print("=" * 60)
-    print("STARTING OCR FILE FINDER")
-    print(f"Prompt directory: {prompt_dir}")
-    print("=" * 60)
+    log.info("=" * 60)
+    log.info("STARTING OCR FILE FINDER")
+    log.info("Prompt directory: %s", prompt_dir)
+    log.info("=" * 60)
 
     # First, check for X-ray cover matches and replace files immediately
-    print("\n--- X-RAY COVER REPLACEMENT PHASE ---")
+    log.info("\n--- X-RAY COVER REPLACEMENT PHASE ---")
+    xray_index = index_xray_covers(xray_covers_dir)
     for base_name in get_file_base_names(prompt_dir):
-        xray_match = search_xray_covers_for_match(base_name, xray_covers_dir)
+        xray_match = search_xray_covers_for_match(base_name, xray_index)
         if xray_match:
             # Find the original file and replace it with X-ray version
             original_file = find_original_file(prompt_dir, base_name)
             if original_file and os.path.exists(original_file):
                 # Replace original file with X-ray cover file
-                shutil.move(xray_match, original_file)
-                print(f"✓ Replaced {base_name} with X-ray cover version")
+                move_file(xray_match, original_file)
+                xray_index = [item for item in xray_index if item[1] != xray_match]
+                log.info("✓ Replaced %s with X-ray cover version", base_name)
 
     # Rename all original files to include "- Copy"
-    print("\n--- FILE RENAMING PHASE ---")
+    log.info("\n--- FILE RENAMING PHASE ---")
     rename_original_files_to_copy(prompt_dir)
-    print("✓ Renamed all original files to include '- Copy'")
+    log.info("✓ Renamed all original files to include '- Copy'")
 
     # Now process OCR matches with updated file list (including X-ray replacements)
-    print("\n--- OCR MATCHING PHASE ---")
+    log.info("\n--- OCR MATCHING PHASE ---")
     file_list = get_file_base_names(prompt_dir)
 
     if not file_list:
-        print("DEBUG: No files to process")
+        log.debug("No files to process")
         return
 
-    # Create search tasks - assign each file to a worker before starting
+    # Create search tasks - several files can share the same search name
     search_tasks = []
     for base_name in file_list:
         search_name = base_name.replace(" - Copy", "").split(" (")[0]  # Remove copy indicators
         search_tasks.append({
             'base_name': base_name,
             'search_name': search_name,
-            'assigned_worker': len(search_tasks) % 8  # Assign to worker 0-7
         })
 
-    print(f"Assigned {len(search_tasks)} files to 8 workers")
+    # Search for every name at once so each directory tree is walked only once
+    search_names = list(dict.fromkeys(task['search_name'] for task in search_tasks))
+    log.info("Searching for %d names", len(search_names))
+    results = incremental_search(search_names, search_dirs_2025, search_dirs_all)
 
-    # Execute searches in parallel with pre-assigned workers
-    def search_worker(task):
-        """Worker function that performs the incremental search for one file."""
-        base_name = task['base_name']
-        search_name = task['search_name']
-        worker_id = task['assigned_worker']
-
-        print(f"Worker {worker_id}: Searching {search_name}...")
-
-        # Search for OCR matches using incremental search
-        matches, _ = incremental_search(search_name, search_dirs_2025, search_dirs_all)
-
-        return {
-            'base_name': base_name,
-            'search_name': search_name,
-            'worker_id': worker_id,
-            'matches': matches
-        }
-
-    # Run all searches in parallel
-    results = []
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        future_to_task = {executor.submit(search_worker, task): task for task in search_tasks}
-
-        for future in as_completed(future_to_task):
-            result = future.result()
-            results.append(result)
+    for task in search_tasks:
+        matches = results.get(task['search_name'])
+        if matches:
+            copied_count = copy_files_from_matching_folders(matches, prompt_dir, task['search_name'])
+            log.info("✓ Found and copied %d files for %s", copied_count, task['search_name'])
+        else:
+            log.info("✗ No matches found for %s", task['search_name'])
 
-            # Process results as they complete
-            if result['matches']:
-                copied_count = copy_files_from_matching_folders(result['matches'], prompt_dir, result['search_name'])
-                print(f"✓ Worker {result['worker_id']}: Found and copied {copied_count} files for {result['search_name']}")
-            else:
-                print(f"✗ Worker {result['worker_id']}: No matches found for {result['search_name']}")
+    log.info("\nCompleted processing %d files", len(search_tasks))
 
-    print(f"\nCompleted processing {len(results)} files")
+    _IO_POOL.shutdown()
 
-    print("\n" + "=" * 60)
-    print("OCR FILE FINDER COMPLETED")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info("OCR FILE FINDER COMPLETED")
+    log.info("=" * 60)
 
     ctypes.windll.user32.MessageBoxW(0, "Found Records!", "Finished", 0x00040000 | 0x00000001)
-    os._exit(0)
+    sys.exit(0)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,34 +1,114 @@
 import os
+import re
 import shutil
 import sys
 import ctypes
-import filecmp
+import atexit
+import threading
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def get_file_base_names(prompt_dir):
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# CopyFileExW goes through the SMB redirector, which can copy server-side (copychunk/ODX)
+# instead of buffering every byte in user space; MoveFileExW renames in a single call.
+# FindFirstFileExW with FIND_FIRST_EX_LARGE_FETCH asks SMB for bigger directory batches per round trip.
+if os.name == 'nt':
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+
+    _CopyFileExW = _kernel32.CopyFileExW
+    _CopyFileExW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_void_p, ctypes.c_void_p,
+                             ctypes.POINTER(wintypes.BOOL), wintypes.DWORD]
+    _CopyFileExW.restype = wintypes.BOOL
+
+    _MoveFileExW = _kernel32.MoveFileExW
+    _MoveFileExW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD]
+    _MoveFileExW.restype = wintypes.BOOL
+
+    _FindFirstFileExW = _kernel32.FindFirstFileExW
+    _FindFirstFileExW.argtypes = [wintypes.LPCWSTR, ctypes.c_int, ctypes.c_void_p, ctypes.c_int,
+                                  ctypes.c_void_p, wintypes.DWORD]
+    _FindFirstFileExW.restype = wintypes.HANDLE
+    _FindNextFileW = _kernel32.FindNextFileW
+    _FindNextFileW.argtypes = [wintypes.HANDLE, ctypes.c_void_p]
+    _FindNextFileW.restype = wintypes.BOOL
+    _FindClose = _kernel32.FindClose
+    _FindClose.argtypes = [wintypes.HANDLE]
+else:
+    _CopyFileExW = None
+    _MoveFileExW = None
+    _FindFirstFileExW = None
+
+MOVEFILE_REPLACE_EXISTING = 0x1
+MOVEFILE_COPY_ALLOWED = 0x2
+FIND_EX_INFO_BASIC = 1
+FIND_EX_SEARCH_NAME_MATCH = 0
+FIND_FIRST_EX_LARGE_FETCH = 2
+FILE_ATTRIBUTE_DIRECTORY = 0x10
+FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+IO_REPARSE_TAG_SYMLINK = 0xA000000C
+ERROR_NO_MORE_FILES = 18
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+# Every casing of the .db extension, so names can be checked without lower()
+_SKIP_EXT = ('.db', '.DB', '.Db', '.dB')
+
+# Shared pool for directory listings and walks; these are pure I/O waits, so run many at once
+_IO_POOL = ThreadPoolExecutor(max_workers=128, thread_name_prefix="ocr-io")
+atexit.register(_IO_POOL.shutdown)
+
+# Concurrent copies per folder, and folders copied at once; keeps at most 64 copies in flight
+FILE_COPY_WORKERS = 32
+FOLDER_COPY_WORKERS = 2
+
+def map_base_names(prompt_dir):
+    """Map each base name in prompt_dir to its files (excluding .db files) from a single scan."""
+    base_map = {}
+    with os.scandir(prompt_dir) as it:
+        for entry in it:
+            if entry.is_file(follow_symlinks=False) and not entry.name.endswith(_SKIP_EXT):
+                base_map.setdefault(os.path.splitext(entry.name)[0], []).append(entry.path)
+    return base_map
+
+def get_file_base_names(base_map):
     """Get base names of files excluding .db files."""
-    return [
-        os.path.splitext(f)[0]
-        for f in os.listdir(prompt_dir)
-        if os.path.isfile(os.path.join(prompt_dir, f)) and not f.lower().endswith('.db')
-    ]
+    return [base for base, paths in base_map.items() for _ in paths]
+
+def list_day_folders(month_path):
+    """Get the names of the day folders in a month folder."""
+    try:
+        with os.scandir(month_path) as it:
+            return {entry.name for entry in it if entry.is_dir()}
+    except OSError:
+        return set()
 
 def find_previous_business_day_folders(search_dirs_2025):
     """Collect all valid 'day' subfolders from the past year in the 2025 directories."""
     current_date = datetime.now()
+    wanted_days = []
+    for days_back in range(1, 366):
+        target_date = current_date - timedelta(days=days_back)
+        wanted_days.append((target_date.strftime("%m-%Y"), target_date.strftime("%m_%d")))
+
+    # List each month folder once per server instead of probing every day
+    month_parts = dict.fromkeys(month_part for month_part, _ in wanted_days)
+    futures = {
+        _IO_POOL.submit(list_day_folders, os.path.join(base_dir, month_part)): (base_dir, month_part)
+        for base_dir in search_dirs_2025
+        for month_part in month_parts
+    }
+    month_days = {futures[fut]: fut.result() for fut in as_completed(futures)}
+
     found_dirs = []
-    with ThreadPoolExecutor() as executor:
-        for days_back in range(1, 366):
-            target_date = current_date - timedelta(days=days_back)
-            month_part = target_date.strftime("%m-%Y")
-            day_part = target_date.strftime("%m_%d")
-            check_paths = [os.path.join(base_dir, month_part, day_part) for base_dir in search_dirs_2025]
-            futures = {executor.submit(os.path.isdir, path): path for path in check_paths}
-            for fut in as_completed(futures):
-                p = futures[fut]
-                if fut.result():
-                    found_dirs.append(p)
+    for month_part, day_part in wanted_days:
+        for base_dir in search_dirs_2025:
+            if day_part in month_days[(base_dir, month_part)]:
+                found_dirs.append(os.path.join(base_dir, month_part, day_part))
     return found_dirs
 
 def get_month_folders(search_dirs, target_month, exclude_dirs):
@@ -45,77 +125,218 @@ def get_month_folders(search_dirs, target_month, exclude_dirs):
                     folders.append(dir_path)
     return folders
 
-def search_directory_for_matches(root_dir, target_name):
-    """Recursively find all directories containing 'target_name' in their folder name."""
-    matches = []
-    for entry in os.scandir(root_dir):
-        if entry.is_dir():
-            if target_name in entry.name:
-                matches.append(entry.path)
-            matches.extend(search_directory_for_matches(entry.path, target_name))
+def iter_subdirs(path):
+    """
+    Yield (name, path) for each subdirectory of path, without following symlinks.
+    On Windows this enumerates with FindFirstFileExW and FIND_FIRST_EX_LARGE_FETCH,
+    reading the directory flag straight from dwFileAttributes.
+    """
+    if _FindFirstFileExW is None:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield entry.name, entry.path
+        return
+
+    find_data = wintypes.WIN32_FIND_DATAW()
+    handle = _FindFirstFileExW(os.path.join(path, '*'), FIND_EX_INFO_BASIC, ctypes.byref(find_data),
+                               FIND_EX_SEARCH_NAME_MATCH, None, FIND_FIRST_EX_LARGE_FETCH)
+    if handle == INVALID_HANDLE_VALUE:
+        raise ctypes.WinError(ctypes.get_last_error())
+
+    try:
+        while True:
+            name = find_data.cFileName
+            attrs = find_data.dwFileAttributes
+            # Skip '.', '..' and symlinks, the same entries os.scandir's is_dir(follow_symlinks=False) drops
+            if (attrs & FILE_ATTRIBUTE_DIRECTORY and name not in ('.', '..')
+                    and not (attrs & FILE_ATTRIBUTE_REPARSE_POINT
+                             and find_data.dwReserved0 == IO_REPARSE_TAG_SYMLINK)):
+                yield name, os.path.join(path, name)
+            if not _FindNextFileW(handle, ctypes.byref(find_data)):
+                error = ctypes.get_last_error()
+                if error != ERROR_NO_MORE_FILES:
+                    raise ctypes.WinError(error)
+                return
+    finally:
+        _FindClose(handle)
+
+def build_name_matcher(target_names):
+    """
+    Build a function that returns the target names found in a folder name.
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, otherwise a regex prefilter.
+    """
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for name in target_names:
+            automaton.add_word(name, name)
+        automaton.make_automaton()
+        return lambda folder_name: {name for _, name in automaton.iter(folder_name)}
+
+    pattern = re.compile("|".join(map(re.escape, target_names)))
+
+    def match_names(folder_name):
+        # The regex rejects most folders in one pass; only hits check each name
+        if not pattern.search(folder_name):
+            return ()
+        return [name for name in target_names if name in folder_name]
+
+    return match_names
+
+def search_directory_for_matches(root_dir, match_names, name_count, stop_event=None):
+    """
+    Find all directories whose folder name contains one of name_count target
+    names, as reported by match_names (see build_name_matcher).
+    Walks the tree once and returns a dict of target name -> matching folders.
+    A matched folder is only searched further for the names it didn't match,
+    since the whole folder gets copied, and is skipped once every name has
+    matched on its path.
+    Stops early, returning what it has so far, once stop_event is set.
+    """
+    matches = {}
+    stack = [(root_dir, frozenset())]
+    while stack:
+        if stop_event is not None and stop_event.is_set():
+            return matches
+        current, matched = stack.pop()
+        try:
+            for folder_name, path in iter_subdirs(current):
+                hits = match_names(folder_name)
+                if not hits:
+                    stack.append((path, matched))
+                    continue
+                for target in hits:
+                    if target not in matched:
+                        matches.setdefault(target, []).append(path)
+                matched_here = matched.union(hits)
+                if len(matched_here) < name_count:
+                    stack.append((path, matched_here))
+        except OSError:
+            continue
     return matches
 
-def phased_search(base_name, search_phases):
+def is_within(path, roots):
+    """Check whether path is one of roots or lies inside one of them."""
+    while path not in roots:
+        parent = os.path.dirname(path)
+        if parent == path:
+            return False
+        path = parent
+    return True
+
+def phased_search(target_names, search_phases, stop_on_first_phase=True):
     """
-    Run multiple search phases, collecting all matching folders
-    without stopping at the first match.
+    Run multiple search phases for all target names at once, collecting all
+    matching folders. With stop_on_first_phase, a name is dropped from later
+    phases once it has matches, and no further phase runs once every name has one;
+    the phase that found them always runs to completion.
+    Returns a dict of target name -> matching folders, and the searched dirs.
     """
+    stop_event = threading.Event()
     searched_dirs = set()
-    all_matches = []
+    all_matches = {}
+    pending = set(target_names)
+    if not pending:
+        return all_matches, searched_dirs
+
     for phase in search_phases:
-        phase_dirs = phase['get_dirs'](searched_dirs)
+        if stop_on_first_phase and not pending:
+            # Every name has a match; skip the remaining phases
+            break
+        names = [t for t in target_names if t in pending] if stop_on_first_phase else target_names
+
+        # Skip directories inside trees an earlier phase has already walked
+        phase_dirs = [d for d in phase['get_dirs'](searched_dirs) if not is_within(d, searched_dirs)]
         if not phase_dirs:
             continue
-        with ThreadPoolExecutor(max_workers=16) as executor:
-            futures = {executor.submit(search_directory_for_matches, d, base_name): d for d in phase_dirs}
+        match_names = build_name_matcher(names)
+        futures = [_IO_POOL.submit(search_directory_for_matches, d, match_names, len(names), stop_event)
+                   for d in phase_dirs]
+        try:
             for fut in as_completed(futures):
-                result = fut.result()
-                if result:
-                    all_matches.extend(result)
+                for target, paths in fut.result().items():
+                    all_matches.setdefault(target, []).extend(paths)
+                    pending.discard(target)
+        except BaseException:
+            # Don't leave the rest of this phase's walks running on the shared pool
+            stop_event.set()
+            raise
         searched_dirs.update(phase_dirs)
     return all_matches, searched_dirs
 
-def copy_folder_with_contents(src_folder, dest_dir):
+def copy_file(src, dst):
+    """Copy a file with CopyFileExW where available, falling back to shutil.copy2."""
+    if _CopyFileExW is not None and _CopyFileExW(src, dst, None, None, None, 0):
+        return
+    shutil.copy2(src, dst)
+
+def move_file(src, dst, replace=False):
+    """
+    Move a file to the full path dst with MoveFileExW where available, falling back to shutil.move.
+    An existing dst is only overwritten with replace; otherwise shutil.Error is raised.
+    """
+    flags = MOVEFILE_COPY_ALLOWED | (MOVEFILE_REPLACE_EXISTING if replace else 0)
+    if _MoveFileExW is not None and _MoveFileExW(src, dst, flags):
+        return
+    if not replace and os.path.exists(dst):
+        raise shutil.Error(f"Destination path '{dst}' already exists")
+    shutil.move(src, dst)
+
+def reserve_name(folder_name, existing, name_lock):
+    """
+    Pick the first free name out of folder_name, '<folder_name> - Copy (N)' in
+    existing and claim it. name_lock keeps concurrent workers from picking the same one.
+    """
+    with name_lock:
+        dest_name = folder_name
+        copy_number = 0
+        while os.path.normcase(dest_name) in existing:
+            copy_number += 1
+            dest_name = f"{folder_name} - Copy ({copy_number})"
+        existing.add(os.path.normcase(dest_name))
+    return dest_name
+
+def copy_folder_with_contents(src_folder, dest_dir, existing=None, name_lock=None):
     """
     Copy the entire folder structure to dest_dir, handling naming conflicts.
+    Workers copying into the same dest_dir should share one existing-names set and lock.
     Returns the path to the copied folder.
     """
-    folder_name = os.path.basename(src_folder)
-    dest_folder = os.path.join(dest_dir, folder_name)
-    
+    if existing is None:
+        with os.scandir(dest_dir) as it:
+            existing = {os.path.normcase(entry.name) for entry in it}
+        name_lock = threading.Lock()
+
     # Handle naming conflicts
-    if os.path.exists(dest_folder):
-        copy_number = 1
-        while True:
-            temp_name = f"{folder_name} - Copy ({copy_number})"
-            attempt = os.path.join(dest_dir, temp_name)
-            if not os.path.exists(attempt):
-                dest_folder = attempt
-                break
-            copy_number += 1
+    dest_folder = os.path.join(dest_dir, reserve_name(os.path.basename(src_folder), existing, name_lock))
 
     os.makedirs(dest_folder, exist_ok=True)
 
-    # Copy all contents except .db files
+    # Collect all contents except .db files, and every subfolder to recreate
+    copy_pairs = []
+    subdirs = []
     for root, dirs, files in os.walk(src_folder):
-        for d in dirs:
-            rel_path = os.path.relpath(os.path.join(root, d), src_folder)
-            os.makedirs(os.path.join(dest_folder, rel_path), exist_ok=True)
+        subdir = os.path.join(dest_folder, os.path.relpath(root, src_folder))
+        if root != src_folder:
+            subdirs.append(subdir)
         for f in files:
-            if not f.lower().endswith('.db'):
-                rel_root = os.path.relpath(root, src_folder)
-                subdir = os.path.join(dest_folder, rel_root)
-                os.makedirs(subdir, exist_ok=True)
-                shutil.copy2(os.path.join(root, f), os.path.join(subdir, f))
+            if not f.endswith(_SKIP_EXT):
+                copy_pairs.append((os.path.join(root, f), os.path.join(subdir, f)))
+
+    # Create each destination subfolder once, parents first
+    for subdir in sorted(subdirs, key=lambda d: d.count(os.sep)):
+        os.makedirs(subdir, exist_ok=True)
+
+    # Copy the files concurrently so their SMB round trips overlap
+    with ThreadPoolExecutor(max_workers=FILE_COPY_WORKERS) as executor:
+        list(executor.map(lambda pair: copy_file(*pair), copy_pairs))
 
     return dest_folder
 
-def find_original_file(prompt_dir, base_name):
+def find_original_file(base_map, base_name):
     """Find the original file with the given base name."""
-    for fname in os.listdir(prompt_dir):
-        if fname.startswith(base_name + '.'):
-            return os.path.join(prompt_dir, fname)
-    return None
+    paths = base_map.get(base_name)
+    return paths[0] if paths else None
 
 def rename_and_move_original(original_file_path, dest_folder):
     """
@@ -137,45 +358,64 @@ def rename_and_move_original(original_file_path, dest_folder):
         dest_path = os.path.join(dest_folder, alt_name)
         copy_num += 1
     
-    shutil.move(original_file_path, dest_path)
+    move_file(original_file_path, dest_path)
 
-def search_xray_covers_for_match(base_name, xray_covers_dir):
+def index_xray_covers(xray_covers_dir):
     """
-    Search for matching files in the X-ray covers directory.
-    Returns the full path of the matching file if found, None otherwise.
+    List the X-ray covers directory once.
+    Returns a list of (base name, full path) for every non-.db file.
     """
     if not os.path.exists(xray_covers_dir):
-        return None
-    
+        return []
+
     try:
-        for file in os.listdir(xray_covers_dir):
-            if os.path.isfile(os.path.join(xray_covers_dir, file)) and not file.lower().endswith('.db'):
-                file_base = os.path.splitext(file)[0]
-                if base_name in file_base:
-                    return os.path.join(xray_covers_dir, file)
+        with os.scandir(xray_covers_dir) as it:
+            return [
+                (os.path.splitext(entry.name)[0], entry.path)
+                for entry in it
+                if entry.is_file() and not entry.name.endswith(_SKIP_EXT)
+            ]
     except (OSError, PermissionError):
-        pass
+        return []
+
+def search_xray_covers_for_match(base_name, xray_index):
+    """
+    Search the X-ray covers index for a file matching base_name.
+    Returns the full path of the matching file if found, None otherwise.
+    """
+    for file_base, path in xray_index:
+        if base_name in file_base:
+            return path
     return None
 
-def copy_matching_contents(matching_folders, prompt_dir, base_name):
+def copy_matching_contents(matching_folders, prompt_dir, base_name, base_map):
     """
     1) Copy each matching folder to the prompt directory
     2) Find the original file and rename it to include '- Copy'
     3) Move the renamed original file into each copied folder
+    base_map is updated once the original file has been removed.
     """
     if not matching_folders:
         return
 
     # Find the original file
-    original_file_path = find_original_file(prompt_dir, base_name)
+    original_file_path = find_original_file(base_map, base_name)
     if not original_file_path:
         return
 
     copied_folders = []
-    
+
+    # One listing of the prompt directory, shared by the copy workers, to hand out folder names
+    with os.scandir(prompt_dir) as it:
+        existing = {os.path.normcase(entry.name) for entry in it}
+    name_lock = threading.Lock()
+
     # Copy all matching folders
-    with ThreadPoolExecutor() as executor:
-        futures = {executor.submit(copy_folder_with_contents, folder, prompt_dir): folder for folder in matching_folders}
+    with ThreadPoolExecutor(max_workers=FOLDER_COPY_WORKERS) as executor:
+        futures = {
+            executor.submit(copy_folder_with_contents, folder, prompt_dir, existing, name_lock): folder
+            for folder in matching_folders
+        }
         for fut in as_completed(futures):
             copied_folder = fut.result()
             copied_folders.append(copied_folder)
@@ -186,19 +426,34 @@ def copy_matching_contents(matching_folders, prompt_dir, base_name):
     new_filename = f"{base} - Copy{ext}"
     
     for copied_folder in copied_folders:
-        dest_path = os.path.join(copied_folder, new_filename)
-        
-        # Handle naming conflicts
+        # Handle naming conflicts against one listing of the copied folder
+        with os.scandir(copied_folder) as it:
+            existing = {os.path.normcase(entry.name) for entry in it}
+        dest_name = new_filename
         copy_num = 1
-        while os.path.exists(dest_path):
-            alt_name = f"{base} - Copy ({copy_num}){ext}"
-            dest_path = os.path.join(copied_folder, alt_name)
+        while os.path.normcase(dest_name) in existing:
+            dest_name = f"{base} - Copy ({copy_num}){ext}"
             copy_num += 1
-        
-        shutil.copy2(original_file_path, dest_path)
+
+        copy_file(original_file_path, os.path.join(copied_folder, dest_name))
     
     # Remove the original file after copying it to all folders
     os.remove(original_file_path)
+    base_map[base_name].remove(original_file_path)
+    if not base_map[base_name]:
+        del base_map[base_name]
+
+def warm_connections(base_dirs):
+    """
+    Open each server share once, one at a time, so its SMB session is set up
+    before the parallel listings race to create it.
+    """
+    for base_dir in base_dirs:
+        try:
+            with os.scandir(base_dir) as it:
+                next(it, None)
+        except OSError:
+            pass
 
 def main():
     if len(sys.argv) < 2:
@@ -209,6 +464,8 @@ def main():
     search_dirs_2025 = [r'\\ronsin158\ocr_processed\2025', r'\\ronsin232\ocr_processed\2025']
     search_dirs_all = [r'\\ronsin158\ocr_processed', r'\\ronsin232\ocr_processed']
     xray_covers_dir = r'\\nas-prod\Archive\X-RAYS TO UPLOAD'
+
+    warm_connections(search_dirs_all)
     
     current_month = datetime.now().strftime("%m-%Y")
     prev_month = (datetime.now().replace(day=1) - timedelta(days=1)).strftime("%m-%Y")
@@ -221,36 +478,44 @@ def main():
         {'get_dirs': lambda sd: get_month_folders(search_dirs_all, "**", sd), 'name': 'full archive'}
     ]
 
-    # First, check for X-ray cover matches and replace files immediately
-    for base_name in get_file_base_names(prompt_dir):
-        xray_match = search_xray_covers_for_match(base_name, xray_covers_dir)
+    # Scan the prompt directory once; lookups below use this map instead of re-listing it.
+    # X-ray covers replace files under the same name, so the list stays valid throughout.
+    base_map = map_base_names(prompt_dir)
+    base_names = get_file_base_names(base_map)
+    xray_index = index_xray_covers(xray_covers_dir)
+
+    # Search for OCR matches for every file at once, so each tree is walked only once
+    all_matches, _ = phased_search(list(dict.fromkeys(base_names)), search_phases)
+
+    for base_name in base_names:
+        # First, check for an X-ray cover match and replace the file before it gets copied
+        xray_match = search_xray_covers_for_match(base_name, xray_index)
         if xray_match:
             # Find the original file and replace it with X-ray version
-            original_file = find_original_file(prompt_dir, base_name)
-            if original_file and os.path.exists(original_file):
+            original_file = find_original_file(base_map, base_name)
+            if original_file:
                 # Replace original file with X-ray cover file
-                shutil.move(xray_match, original_file)
+                move_file(xray_match, original_file, replace=True)
+                xray_index = [item for item in xray_index if item[1] != xray_match]
                 print(f"Replaced {base_name} with X-ray cover version")
 
-    # Now process OCR matches with updated file list (including X-ray replacements)
-    for base_name in get_file_base_names(prompt_dir):
-        # Search for OCR matches
-        matches, _ = phased_search(base_name, search_phases)
-        
+        matches = all_matches.get(base_name)
         if matches:
-            copy_matching_contents(matches, prompt_dir, base_name)
+            copy_matching_contents(matches, prompt_dir, base_name, base_map)
             print(f"Copied matches for {base_name}")
         else:
             # If absolutely no matches, move the base file(s) into "NOT IN OCR"
             unable_dir = os.path.join(prompt_dir, "NOT IN OCR")
             os.makedirs(unable_dir, exist_ok=True)
-            for f in os.listdir(prompt_dir):
-                if f.startswith(base_name + '.'):
-                    shutil.move(os.path.join(prompt_dir, f), unable_dir)
+            for path in base_map.pop(base_name, []):
+                move_file(path, os.path.join(unable_dir, os.path.basename(path)))
             print(f"No matches found for {base_name}")
 
+    # Let any outstanding background I/O drain before reporting completion
+    _IO_POOL.shutdown(wait=True)
+
     ctypes.windll.user32.MessageBoxW(0, "Records Copied!", "Finished", 0x00040000 | 0x00000001)
-    os._exit(0)
+    sys.exit(0)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file